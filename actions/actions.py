@@ -6,6 +6,8 @@ from rasa_sdk.executor import CollectingDispatcher
 from rasa_sdk.forms import FormValidationAction
 from rasa_sdk.events import SlotSet, ActiveLoop, FollowupAction
 
+from actions.cache import reads_slots, reads_value
+
 
 class ValidateWifiMainForm(FormValidationAction):
     def name(self) -> Text:
@@ -34,7 +36,7 @@ class ValidateWifiMainForm(FormValidationAction):
 
         return req
 
-    def validate_device_type(
+    async def validate_device_type(
         self,
         value: Any,
         dispatcher: CollectingDispatcher,
@@ -47,7 +49,8 @@ class ValidateWifiMainForm(FormValidationAction):
         return {"device_type": None}
 
 
-    def validate_scope_issue(
+    @reads_value
+    async def validate_scope_issue(
         self,
         value: Any,
         dispatcher: CollectingDispatcher,
@@ -76,7 +79,7 @@ class ActionRouteAdvice(Action):
     def name(self) -> Text:
         return "action_route_advice"
 
-    def run(
+    async def run(
         self,
         dispatcher: CollectingDispatcher,
         tracker: Tracker,
@@ -284,7 +287,7 @@ class ActionAfterAdvice(Action):
     def name(self) -> Text:
         return "action_after_advice"
 
-    def run(self, dispatcher: CollectingDispatcher, tracker: Tracker, domain: Dict[Text, Any]):
+    async def run(self, dispatcher: CollectingDispatcher, tracker: Tracker, domain: Dict[Text, Any]):
         return [
             SlotSet("resolved", None),
             ActiveLoop(None),
@@ -299,7 +302,7 @@ class ActionIncrementAttemptsOrFinish(Action):
     def name(self) -> Text:
         return "action_increment_attempts_or_finish"
 
-    def run(self, dispatcher: CollectingDispatcher, tracker: Tracker, domain: Dict[Text, Any]):
+    async def run(self, dispatcher: CollectingDispatcher, tracker: Tracker, domain: Dict[Text, Any]):
         resolved = tracker.get_slot("resolved")
         attempt = int(tracker.get_slot("attempt_count") or 0)
         last_advice = tracker.get_slot("last_advice")
@@ -367,7 +370,7 @@ class ActionFlushDnsForPlatform(Action):
     def name(self) -> Text:
         return "action_flush_dns_for_platform"
 
-    def run(self, dispatcher: CollectingDispatcher, tracker: Tracker, domain: Dict[Text, Any]):
+    async def run(self, dispatcher: CollectingDispatcher, tracker: Tracker, domain: Dict[Text, Any]):
         platform = tracker.get_slot("platform")
 
         if platform == "windows":
@@ -410,7 +413,8 @@ class ActionResetTroubleshoot(Action):
     def name(self) -> Text:
         return "action_reset_troubleshoot"
 
-    def run(self, dispatcher: CollectingDispatcher, tracker: Tracker, domain: Dict[Text, Any]):
+    @reads_slots()
+    async def run(self, dispatcher: CollectingDispatcher, tracker: Tracker, domain: Dict[Text, Any]):
         return [
             SlotSet("attempt_count", 0),
             SlotSet("device_type", None),
@@ -0,0 +1,34 @@
+# blocking.py
+import asyncio
+import functools
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+# Max threads per action-server worker process for blocking helpers
+# (DNS lookups, pinging the gateway, subprocess calls, ...).
+BLOCKING_THREADS = int(os.environ.get("ACTION_BLOCKING_THREADS", "4"))
+
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    # Created lazily so every worker process gets its own pool after fork.
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=BLOCKING_THREADS,
+            thread_name_prefix="action-blocking",
+        )
+    return _executor
+
+
+async def run_blocking(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """
+    Run a blocking call on the bounded thread pool and await its result,
+    so one slow diagnostic doesn't stall every other conversation.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _get_executor(), functools.partial(func, *args, **kwargs)
+    )
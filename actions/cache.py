@@ -0,0 +1,161 @@
+# cache.py
+import functools
+import logging
+import os
+import pickle
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Text, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Max entries per cached action/validator
+CACHE_SIZE = int(os.environ.get("ACTION_CACHE_SIZE", "256"))
+# Log hit/miss counters every N lookups (per worker process)
+CACHE_LOG_EVERY = int(os.environ.get("ACTION_CACHE_LOG_EVERY", "1000"))
+
+_caches: Dict[Text, "SlotCache"] = {}
+_lookups = 0
+
+_SCALARS = (str, int, float, bool, type(None))
+
+
+def _scalar_dict(d: Any) -> bool:
+    return type(d) is dict and all(type(v) in _SCALARS for v in d.values())
+
+
+def _flat_message(m: Dict) -> bool:
+    # utter_message() always adds buttons/elements/custom, usually empty
+    return all(type(v) in _SCALARS or (type(v) in (list, dict) and not v) for v in m.values())
+
+
+def _copy_message(m: Dict) -> Dict:
+    return {k: v if type(v) in _SCALARS else type(v)() for k, v in m.items()}
+
+
+class SlotCache:
+    """
+    Bounded LRU of prebuilt (messages, result) pairs with hit/miss counters.
+    Every hit gets its own copy, so callers can't change what later hits see.
+    Entries made only of scalars (plus empty message containers) are copied
+    dict by dict; anything nested is stored pickled and decoded per hit.
+    """
+
+    def __init__(self, name: Text, maxsize: int = CACHE_SIZE):
+        self.name = name
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Hashable, Tuple[bool, Any]]" = OrderedDict()
+
+    def put(self, key: Hashable, messages: List[Dict], result: Any) -> None:
+        if isinstance(result, list):
+            flat_result = all(_scalar_dict(e) for e in result)
+        else:
+            flat_result = _scalar_dict(result)
+
+        if flat_result and all(_flat_message(m) for m in messages):
+            result = tuple(dict(e) for e in result) if isinstance(result, list) else dict(result)
+            entry = (True, (tuple(_copy_message(m) for m in messages), result))
+        else:
+            entry = (False, pickle.dumps((messages, result), pickle.HIGHEST_PROTOCOL))
+
+        self._data[key] = entry
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def stats(self) -> Dict[Text, int]:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._data)}
+
+
+def cache_stats() -> Dict[Text, Dict[Text, int]]:
+    """Hit/miss counters for every cache in this worker process."""
+    return {name: cache.stats() for name, cache in _caches.items()}
+
+
+def _log_stats() -> None:
+    logger.info(f"cache stats (pid {os.getpid()}, {_lookups} lookups): {cache_stats()}")
+
+
+def _memoize(key_fn: Callable[..., Hashable], func: Callable) -> Callable:
+    # always a fresh cache: after --auto-reload the old entries came from old code
+    name = f"{func.__module__}.{func.__qualname__}"
+    cache = _caches[name] = SlotCache(name)
+    data = cache._data
+
+    @functools.wraps(func)
+    async def wrapper(self, *args):
+        # args are (dispatcher, tracker, domain) or (value, dispatcher, tracker, domain)
+        global _lookups
+        _lookups += 1
+        if _lookups % CACHE_LOG_EVERY == 0:
+            _log_stats()
+
+        key = key_fn(*args)
+        try:
+            entry = data.get(key)
+            hashable = True
+        except TypeError:  # unhashable slot value, just run it
+            hashable = False
+        if not hashable:
+            return await func(self, *args)
+
+        # hit path is inlined: it has to beat the action body it replaces
+        if entry is not None:
+            data.move_to_end(key)
+            cache.hits += 1
+            flat, payload = entry
+            if not flat:
+                messages, result = pickle.loads(payload)
+                args[-3].messages.extend(messages)
+                return result
+
+            messages, result = payload
+            if messages:
+                args[-3].messages.extend([_copy_message(m) for m in messages])
+            if type(result) is tuple:
+                return [dict(e) for e in result]
+            return dict(result)
+
+        cache.misses += 1
+        dispatcher = args[-3]
+        start = len(dispatcher.messages)
+        result = await func(self, *args)
+        cache.put(key, dispatcher.messages[start:], result)
+        return result
+
+    wrapper.cache = cache
+    return wrapper
+
+
+def reads_slots(*slots: Text) -> Callable:
+    """
+    Declare that an action's run() depends only on these slots.
+    Results are cached per combination of slot values.
+    """
+
+    # type is part of the key so True / 1 / 1.0 don't share an entry
+    def decorator(func: Callable) -> Callable:
+        if not slots:
+            key_fn = lambda dispatcher, tracker, domain: ()
+        elif len(slots) == 1:
+            slot = slots[0]
+
+            def key_fn(dispatcher, tracker, domain):
+                value = tracker.get_slot(slot)
+                return type(value), value
+
+        else:
+
+            def key_fn(dispatcher, tracker, domain):
+                values = [tracker.get_slot(s) for s in slots]
+                return tuple((type(v), v) for v in values)
+
+        return _memoize(key_fn, func)
+
+    return decorator
+
+
+def reads_value(func: Callable) -> Callable:
+    """Declare that a validate_<slot> method depends only on the value being validated."""
+    # type is part of the key so True / 1 / 1.0 don't share an entry
+    return _memoize(lambda value, dispatcher, tracker, domain: (type(value), value), func)
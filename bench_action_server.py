@@ -0,0 +1,120 @@
+# bench_action_server.py
+#
+# Fire concurrent webhook calls at a running action server and report
+# throughput + latency. Run it once against `rasa run actions` and once
+# against `python3 run_action_server.py --workers N` to compare.
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import aiohttp
+
+ACTION_URL = "http://localhost:5055/webhook"
+
+SLOTS = {
+    "attempt_count": 0,
+    "device_type": "computer",
+    "loads_example": True,
+    "scope_issue": "everything",
+    "random_failures": True,
+    "other_devices": False,
+    "sees_login": None,
+    "can_restart_router": True,
+    "resolved": None,
+    "last_advice": None,
+    "platform": "linux",
+}
+
+
+def _payload(action: str, i: int) -> dict:
+    sender = f"bench_{i}"
+    return {
+        "next_action": action,
+        "sender_id": sender,
+        "tracker": {
+            "sender_id": sender,
+            "slots": SLOTS,
+            "latest_message": {"text": "", "intent": {}, "entities": []},
+            "events": [],
+            "paused": False,
+            "followup_action": None,
+            "active_loop": {},
+            "latest_action_name": None,
+        },
+        "domain": {},
+        "version": "3.6.2",
+    }
+
+
+async def _worker(session, url, actions, counter, total, latencies, errors):
+    while True:
+        i = counter[0]
+        if i >= total:
+            return
+        counter[0] += 1
+
+        t0 = time.perf_counter()
+        try:
+            async with session.post(url, json=_payload(actions[i % len(actions)], i)) as r:
+                await r.read()
+                if r.status != 200:
+                    errors.append(r.status)
+                    continue
+        except aiohttp.ClientError as e:
+            errors.append(str(e))
+            continue
+        # only successful responses count towards latency and throughput
+        latencies.append(time.perf_counter() - t0)
+
+
+async def bench(url: str, actions, total: int, concurrency: int):
+    latencies = []
+    errors = []
+    counter = [0]
+
+    async with aiohttp.ClientSession() as session:
+        t0 = time.perf_counter()
+        await asyncio.gather(
+            *(
+                _worker(session, url, actions, counter, total, latencies, errors)
+                for _ in range(concurrency)
+            )
+        )
+        elapsed = time.perf_counter() - t0
+
+    ok = len(latencies)
+    print(f"requests:    {total} ({ok} ok, {len(errors)} errors)")
+    print(f"concurrency: {concurrency}")
+    print(f"elapsed:     {elapsed:.2f}s")
+    print(f"throughput:  {ok / elapsed:.1f} req/s")
+    if errors:
+        print(f"first error: {errors[0]}")
+    if not latencies:
+        return
+
+    latencies.sort()
+    p95 = latencies[max(0, int(ok * 0.95) - 1)]
+    print(f"latency p50: {statistics.median(latencies) * 1000:.1f} ms")
+    print(f"latency p95: {p95 * 1000:.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the action server under concurrent load.")
+    parser.add_argument("--url", default=ACTION_URL)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument(
+        "--action",
+        action="append",
+        help="Action name to call (repeatable). Default: route_advice + flush_dns.",
+    )
+    args = parser.parse_args()
+
+    actions = args.action or ["action_route_advice", "action_flush_dns_for_platform"]
+    asyncio.run(bench(args.url, actions, args.requests, args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
@@ -5,31 +5,29 @@ import signal
 import subprocess
 import time
 import threading
-import requests
 from pynput import keyboard
 
-RASA_URL = "http://localhost:5005/webhooks/rest/webhook"
-
-
-SENDER = "voice_user"
+import session_recorder
+from voice_pipeline import guard_bits, route_text, transcribe_whisper
 
 WAV_PATH = "/tmp/ptt_input.wav"
-WHISPER_MODEL = "base"
-LANG = "en"
 VOICE = "en-US-JennyNeural"
 
 MIN_RECORD_SECONDS = 0.4
 MIN_WAV_BYTES = 8000
 
+# Opt-in turn recorder: set PTT_RECORD_DIR to capture turns for replay_sessions.py
+RECORD_DIR = os.environ.get("PTT_RECORD_DIR")
+RECORD_MAX_MB = int(os.environ.get("PTT_RECORD_MAX_MB", "64"))
+RECORD_VAD_TRIM = os.environ.get("PTT_RECORD_VAD_TRIM") == "1"
+
 _arecord_proc = None
 _is_recording = False
 _record_start_time = 0.0
+_record_seconds = 0.0
 _busy = False
 _lock = threading.Lock()
-
-# client-side states
-_waiting_for_platform = False
-_waiting_yesno = False  # guard for "did that fix it?"
+_recorder = None
 
 
 def speak(text: str):
@@ -64,7 +62,7 @@ def start_recording():
 
 
 def stop_recording() -> bool:
-    global _arecord_proc, _is_recording, _record_start_time
+    global _arecord_proc, _is_recording, _record_start_time, _record_seconds
     with _lock:
         if not _is_recording:
             return False
@@ -84,6 +82,7 @@ def stop_recording() -> bool:
 
     with _lock:
         _is_recording = False
+    _record_seconds = time.time() - _record_start_time
 
     try:
         return os.path.exists(WAV_PATH) and os.path.getsize(WAV_PATH) >= MIN_WAV_BYTES
@@ -91,156 +90,76 @@ def stop_recording() -> bool:
         return False
 
 
-def transcribe_whisper(wav_path: str) -> str:
-    out_dir = "/tmp"
-    base = os.path.splitext(os.path.basename(wav_path))[0]
-    txt_path = os.path.join(out_dir, f"{base}.txt")
+def _record_turn(user_text: str, bot_text: str, flags: int, timings: dict):
     try:
-        os.remove(txt_path)
-    except FileNotFoundError:
-        pass
-
-    subprocess.run(
-        [
-            "whisper", wav_path,
-            "--model", WHISPER_MODEL,
-            "--language", LANG,
-            "--fp16", "False",
-            "--output_format", "txt",
-            "--output_dir", out_dir,
-        ],
-        check=True,
-        stdout=subprocess.DEVNULL,
-        stderr=subprocess.DEVNULL,
-    )
-
-    if not os.path.exists(txt_path):
-        return ""
-    with open(txt_path, "r", encoding="utf-8") as f:
-        return f.read().strip()
-
-
-def ask_rasa(text: str) -> str:
-    r = requests.post(RASA_URL, json={"sender": SENDER, "message": text}, timeout=30)
-    r.raise_for_status()
-    msgs = r.json()
-    return " ".join(m.get("text", "") for m in msgs if m.get("text")).strip()
-
-
-def send_intent(intent_name: str) -> str:
-    """
-    Send a slash intent via the normal webhook pipeline.
-    This is more reliable than trigger_intent + empty message.
-    """
-    return ask_rasa(f"/{intent_name}")
-
-
-def _classify_yesno(text: str):
-    """
-    Returns "yes", "no", or None.
-    """
-    t = text.strip().lower()
-
-    yes_words = [
-        "yes", "yeah", "yep", "yup", "sure", "correct", "fixed", "works", "working",
-        "it works", "it worked", "now works", "now it works"
-    ]
-    no_words = [
-        "no", "nope", "nah", "not", "still", "still broken", "doesn't", "doesnt",
-        "not working", "no change", "didn't", "didnt"
-    ]
-
+        pcm, rate = session_recorder.read_pcm(WAV_PATH)
+    except Exception as e:
+        print("Recording turn failed:", e)
+        return
 
-    if t in ["yes", "yeah", "yep", "yup"]:
-        return "yes"
-    if t in ["no", "nope", "nah"]:
-        return "no"
+    if RECORD_VAD_TRIM:
+        try:
+            pcm = session_recorder.vad_trim(pcm, rate)
+        except Exception as e:
+            print("VAD trim failed, keeping full audio:", e)
 
-    if any(w in t for w in yes_words):
-        return "yes"
-    if any(w in t for w in no_words):
-        return "no"
-    return None
+    try:
+        _recorder.append(pcm, rate, user_text, bot_text, flags, timings)
+    except Exception as e:
+        print("Recording turn failed:", e)
 
 
 def _process_turn():
-    global _busy, _waiting_for_platform, _waiting_yesno
+    global _busy
     print("⏳ Processing…")
+    timings = {"record": _record_seconds}
+    flags = guard_bits()
+    user_text = ""
+    bot_text = ""
 
+    # failed turns are recorded too (empty reply + ASR_FAILED/RASA_FAILED flag)
     try:
-        user_text = transcribe_whisper(WAV_PATH)
-    except subprocess.CalledProcessError:
-        speak("Sorry, I didn't catch that.")
-        with _lock:
-            _busy = False
-        return
-
-    if not user_text:
-        speak("Sorry—try again.")
-        with _lock:
-            _busy = False
-        return
+        t0 = time.perf_counter()
+        try:
+            user_text = transcribe_whisper(WAV_PATH)
+        except subprocess.CalledProcessError:
+            flags |= session_recorder.ASR_FAILED
+        timings["asr"] = time.perf_counter() - t0
 
-    print(f"You: {user_text}")
+        if flags & session_recorder.ASR_FAILED:
+            speak("Sorry, I didn't catch that.")
+            return
 
-    try:
-        # 1) YES/NO GUARD (highest priority)
-        if _waiting_yesno:
-            yn = _classify_yesno(user_text)
-            if yn == "yes":
-                bot_text = send_intent("affirm")
-                _waiting_yesno = False
-            elif yn == "no":
-                bot_text = send_intent("deny")
-                _waiting_yesno = False
-            else:
-                bot_text = "Just say yes or no."
-                # keep waiting
-
-        # 2) PLATFORM GUARD
-        elif _waiting_for_platform:
-            t = user_text.strip().lower()
-
-            if any(k in t for k in ["linux", "ubuntu", "debian", "arch", "fedora", "mint", "kali"]):
-                bot_text = send_intent("platform_linux")
-                _waiting_for_platform = False
-            elif any(k in t for k in ["windows", "win", "win10", "win11", "windows 10", "windows 11"]):
-                bot_text = send_intent("platform_windows")
-                _waiting_for_platform = False
-            elif any(k in t for k in ["mac", "macos", "osx", "macbook", "apple"]):
-                bot_text = send_intent("platform_macos")
-                _waiting_for_platform = False
-            else:
-                bot_text = "Just say Windows, macOS, or Linux."
-
-
-        # 3) NORMAL FLOW
-        else:
-            bot_text = ask_rasa(user_text)
+        if not user_text:
+            speak("Sorry—try again.")
+            return
 
-    except Exception as e:
-        print("Rasa connection failed:", e)
-        speak("I can't reach the server right now.")
-        with _lock:
-            _busy = False
-        return
+        print(f"You: {user_text}")
 
-    if not bot_text:
-        bot_text = "Say that again but, like, clearer."
+        t0 = time.perf_counter()
+        try:
+            bot_text = route_text(user_text)
+        except Exception as e:
+            flags |= session_recorder.RASA_FAILED
+            print("Rasa connection failed:", e)
+        timings["rasa"] = time.perf_counter() - t0
+
+        if flags & session_recorder.RASA_FAILED:
+            speak("I can't reach the server right now.")
+            return
 
-    # Detect modes from bot text
-    low = bot_text.lower()
-    if "which platform are you on" in low:
-        _waiting_for_platform = True
-    if "did that fix it" in low or "did that help" in low:
-        _waiting_yesno = True
+        print(f"Bot: {bot_text}")
+        t0 = time.perf_counter()
+        speak(bot_text)
+        timings["tts"] = time.perf_counter() - t0
 
-    print(f"Bot: {bot_text}")
-    speak(bot_text)
+        print("\nHold SPACE to talk. ESC to quit.")
 
-    print("\nHold SPACE to talk. ESC to quit.")
-    with _lock:
-        _busy = False
+    finally:
+        if _recorder:
+            _record_turn(user_text, bot_text, flags | guard_bits(after=True), timings)
+        with _lock:
+            _busy = False
 
 
 def on_press(key):
@@ -270,6 +189,11 @@ def on_release(key):
 
 
 def main():
+    global _recorder
+    if RECORD_DIR:
+        _recorder = session_recorder.SessionRecorder(RECORD_DIR, RECORD_MAX_MB * 1024 * 1024)
+        print(f"Recording turns to {RECORD_DIR}")
+
     print("✅ Wi-Fi voice assistant (push-to-talk)")
     print("Hold SPACE to talk, release to send. Press ESC to quit.\n")
 
@@ -0,0 +1,125 @@
+# replay_sessions.py
+#
+# Stream recorded turns (see session_recorder.py) back through Whisper and
+# Rasa at full speed (no TTS, no waiting) and compare against the recording.
+# Each recorded session is replayed as its own Rasa conversation.
+#
+#   python3 replay_sessions.py /path/to/record_dir
+#   python3 replay_sessions.py --skip-asr turns-*.ptts   # dialogue only
+
+import argparse
+import os
+import statistics
+import subprocess
+import time
+
+import session_recorder
+import voice_pipeline
+
+REPLAY_WAV = "/tmp/ptt_replay.wav"
+
+
+def _replay_turn(n: int, turn, skip_asr: bool, sender: str, stats: dict):
+    _, rec_asr, rec_rasa, _ = turn.timings
+
+    if turn.flags & session_recorder.RASA_FAILED:
+        stats["skipped_rasa_failed"] += 1  # no recorded reply to compare against
+        return
+
+    # same client-side guard state the live turn started with
+    voice_pipeline.waiting_yesno = bool(turn.flags & session_recorder.YESNO_BEFORE)
+    voice_pipeline.waiting_for_platform = bool(turn.flags & session_recorder.PLATFORM_BEFORE)
+
+    if skip_asr:
+        if turn.flags & session_recorder.ASR_FAILED:
+            return  # nothing to feed Rasa
+        user_text = turn.transcript
+    else:
+        session_recorder.write_wav(REPLAY_WAV, turn.pcm, turn.sample_rate)
+        t0 = time.perf_counter()
+        try:
+            user_text = voice_pipeline.transcribe_whisper(REPLAY_WAV)
+        except subprocess.CalledProcessError as e:
+            stats["errors"] += 1
+            print(f"[{n}] ASR failed: {e}")
+            return
+        if not turn.flags & session_recorder.ASR_FAILED:
+            stats["asr"].append((rec_asr, time.perf_counter() - t0))
+        if user_text != turn.transcript:
+            stats["transcript_diffs"] += 1
+            print(f"[{n}] transcript: {turn.transcript!r} -> {user_text!r}")
+
+    if not user_text:
+        bot_text = ""  # live client doesn't ask Rasa on an empty transcript either
+    else:
+        t0 = time.perf_counter()
+        try:
+            bot_text = voice_pipeline.route_text(user_text, sender)
+        except Exception as e:
+            stats["errors"] += 1
+            print(f"[{n}] Rasa failed: {e}")
+            return
+        # only compare timings when Rasa ran for this turn on both sides
+        if turn.transcript:
+            stats["rasa"].append((rec_rasa, time.perf_counter() - t0))
+
+    if bot_text != turn.reply:
+        stats["reply_diffs"] += 1
+        print(f"[{n}] reply: {turn.reply!r} -> {bot_text!r}")
+
+
+def replay(paths, skip_asr: bool, sender_prefix: str):
+    stats = {
+        "asr": [],  # (recorded, replayed) seconds
+        "rasa": [],
+        "transcript_diffs": 0,
+        "reply_diffs": 0,
+        "skipped_rasa_failed": 0,
+        "errors": 0,
+    }
+    n_turns = 0
+
+    t_start = time.perf_counter()
+    for path in session_recorder.list_segments(paths):
+        # one Rasa conversation per recorded session, so trackers don't carry over
+        sender = f"{sender_prefix}_{session_recorder.segment_session(path)}"
+        try:
+            for turn in session_recorder.iter_turns(path):
+                n_turns += 1
+                _replay_turn(n_turns, turn, skip_asr, sender, stats)
+        except ValueError as e:
+            stats["errors"] += 1
+            print(f"Skipping rest of segment: {e}")
+    elapsed = time.perf_counter() - t_start
+
+    print(f"\nturns:       {n_turns} in {elapsed:.2f}s ({stats['errors']} errors)")
+    print(f"skipped:     {stats['skipped_rasa_failed']} (Rasa was unreachable when recorded)")
+    print(f"transcripts: {stats['transcript_diffs']} changed")
+    print(f"replies:     {stats['reply_diffs']} changed")
+    for stage in ("asr", "rasa"):
+        pairs = stats[stage]
+        if pairs:
+            recorded = statistics.mean(p[0] for p in pairs)
+            replayed = statistics.mean(p[1] for p in pairs)
+            print(
+                f"{stage:<5} mean:  recorded {recorded * 1000:.0f} ms"
+                f" -> replay {replayed * 1000:.0f} ms ({len(pairs)} turns)"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay recorded voice-bot turns.")
+    parser.add_argument("paths", nargs="+", help="Recording dirs or .ptts segment files.")
+    parser.add_argument("--skip-asr", action="store_true", help="Use recorded transcripts instead of Whisper.")
+    parser.add_argument(
+        "--sender-prefix",
+        default=f"replay_{os.getpid()}",
+        help="Rasa sender id prefix; the recorded session id is appended.",
+    )
+    args = parser.parse_args()
+
+    replay(args.paths, args.skip_asr, args.sender_prefix)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,28 @@
+# run_action_server.py
+#
+# Start the action server with several worker processes sharing one port.
+# Same options and logging as `rasa run actions`, plus --workers.
+
+import os
+
+from rasa_sdk.__main__ import main_from_args
+from rasa_sdk.endpoint import create_argument_parser
+
+
+def main():
+    parser = create_argument_parser()
+    parser.description = "Run the action server with multiple workers."
+    parser.set_defaults(actions="actions")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    # rasa_sdk reads the worker count from this env var when it starts Sanic
+    workers = max(1, args.workers)
+    os.environ["ACTION_SERVER_SANIC_WORKERS"] = str(workers)
+
+    print(f"Action server on :{args.port} with {workers} worker(s)")
+    main_from_args(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+# session_recorder.py
+#
+# Compact, append-only binary log of voice-bot turns.
+#
+# Segment file layout (little-endian):
+#   file header:  b"PTTS" + u16 version
+#   per turn:     fixed TURN header, then pcm bytes, transcript utf-8, reply utf-8
+#
+# Files are only ever appended to, so they can be mmap'ed and read while
+# the bot is still running. A new segment starts once max_bytes is reached.
+
+import mmap
+import os
+import struct
+import time
+import wave
+from typing import Iterator, List, NamedTuple, Tuple
+
+FILE_MAGIC = b"PTTS"
+FILE_VERSION = 1
+FILE_HEADER = struct.Struct("<4sH")
+
+TURN_MAGIC = b"TURN"
+# magic, timestamp, sample_rate, pcm_len, transcript_len, reply_len, flags,
+# record/asr/rasa/tts seconds
+TURN_HEADER = struct.Struct("<4sdIIIIB4f")
+
+SEGMENT_SUFFIX = ".ptts"
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+STAGES = ("record", "asr", "rasa", "tts")
+
+# flag bits: client guard state before/after the turn, and failed stages
+YESNO_BEFORE = 1
+PLATFORM_BEFORE = 2
+YESNO_AFTER = 4
+PLATFORM_AFTER = 8
+ASR_FAILED = 16
+RASA_FAILED = 32
+
+
+class Turn(NamedTuple):
+    timestamp: float
+    sample_rate: int
+    pcm: memoryview
+    transcript: str
+    reply: str
+    flags: int
+    timings: Tuple[float, float, float, float]
+
+
+def read_pcm(wav_path: str) -> Tuple[bytes, int]:
+    with wave.open(wav_path, "rb") as w:
+        return w.readframes(w.getnframes()), w.getframerate()
+
+
+def write_wav(wav_path: str, pcm, sample_rate: int):
+    with wave.open(wav_path, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(sample_rate)
+        w.writeframes(pcm)
+
+
+def vad_trim(pcm: bytes, sample_rate: int, aggressiveness: int = 2) -> bytes:
+    """
+    Cut leading/trailing silence: keep first voiced frame .. last voiced frame.
+    Returns the input unchanged if nothing is voiced.
+    """
+    import webrtcvad
+
+    vad = webrtcvad.Vad(aggressiveness)
+    frame_bytes = int(sample_rate * 0.03) * 2  # 30 ms of 16-bit mono
+
+    voiced = [
+        i
+        for i in range(0, len(pcm) - frame_bytes + 1, frame_bytes)
+        if vad.is_speech(pcm[i:i + frame_bytes], sample_rate)
+    ]
+    if not voiced:
+        return pcm
+    return pcm[voiced[0]:voiced[-1] + frame_bytes]
+
+
+class SessionRecorder:
+    def __init__(self, out_dir: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.out_dir = out_dir
+        self.max_bytes = max_bytes
+        # pid keeps two clients started in the same second apart
+        self._session = f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}"
+        self._seq = 0
+        self._f = None
+        os.makedirs(out_dir, exist_ok=True)
+
+    def _open_segment(self):
+        if self._f:
+            self._f.close()
+        self._seq += 1
+        path = os.path.join(self.out_dir, f"turns-{self._session}-{self._seq:04d}{SEGMENT_SUFFIX}")
+        self._f = open(path, "xb")
+        self._f.write(FILE_HEADER.pack(FILE_MAGIC, FILE_VERSION))
+
+    def append(
+        self,
+        pcm: bytes,
+        sample_rate: int,
+        transcript: str,
+        reply: str,
+        flags: int,
+        timings: dict,
+    ):
+        t = transcript.encode("utf-8")
+        r = reply.encode("utf-8")
+        header = TURN_HEADER.pack(
+            TURN_MAGIC,
+            time.time(),
+            sample_rate,
+            len(pcm),
+            len(t),
+            len(r),
+            flags,
+            *(timings.get(s, 0.0) for s in STAGES),
+        )
+        record = b"".join((header, pcm, t, r))
+
+        if self._f is None or self._f.tell() + len(record) > self.max_bytes:
+            self._open_segment()
+        # one write per turn; readers drop a truncated tail after a crash
+        self._f.write(record)
+        self._f.flush()
+
+    def close(self):
+        if self._f:
+            self._f.close()
+            self._f = None
+
+
+def list_segments(paths: List[str]) -> List[str]:
+    out = []
+    for p in paths:
+        if os.path.isdir(p):
+            out += [os.path.join(p, n) for n in os.listdir(p) if n.endswith(SEGMENT_SUFFIX)]
+        else:
+            out.append(p)
+    return sorted(out)
+
+
+def segment_session(path: str) -> str:
+    """Session id of a segment: turns-<session>-NNNN.ptts -> <session>."""
+    name = os.path.basename(path)[len("turns-"):-len(SEGMENT_SUFFIX)]
+    return name.rsplit("-", 1)[0]
+
+
+def iter_turns(path: str) -> Iterator[Turn]:
+    """Yield turns from one segment. pcm is a zero-copy view into the mmap."""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size < FILE_HEADER.size:
+            return
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    buf = memoryview(mm)
+    magic, version = FILE_HEADER.unpack_from(buf, 0)
+    if magic != FILE_MAGIC or version != FILE_VERSION:
+        raise ValueError(f"{path}: not a session recording (version {version})")
+
+    off = FILE_HEADER.size
+    while off + TURN_HEADER.size <= len(buf):
+        magic, ts, rate, n_pcm, n_t, n_r, flags, *timings = TURN_HEADER.unpack_from(buf, off)
+        if magic != TURN_MAGIC:
+            raise ValueError(f"{path}: corrupt record at offset {off}")
+        end = off + TURN_HEADER.size + n_pcm + n_t + n_r
+        if end > len(buf):
+            break  # truncated tail from a crash mid-write
+
+        p = off + TURN_HEADER.size
+        yield Turn(
+            timestamp=ts,
+            sample_rate=rate,
+            pcm=buf[p:p + n_pcm],
+            transcript=bytes(buf[p + n_pcm:p + n_pcm + n_t]).decode("utf-8"),
+            reply=bytes(buf[p + n_pcm + n_t:end]).decode("utf-8"),
+            flags=flags,
+            timings=tuple(timings),
+        )
+        off = end
@@ -0,0 +1,157 @@
+# voice_pipeline.py
+#
+# Speech -> text -> Rasa, plus the client-side yes/no and platform guards.
+# No keyboard/audio-device dependencies, so replay_sessions.py can use it headless.
+
+import os
+import subprocess
+import requests
+
+import session_recorder
+
+RASA_URL = "http://localhost:5005/webhooks/rest/webhook"
+
+
+SENDER = "voice_user"
+
+WHISPER_MODEL = "base"
+LANG = "en"
+
+# client-side states
+waiting_for_platform = False
+waiting_yesno = False  # guard for "did that fix it?"
+
+
+def transcribe_whisper(wav_path: str) -> str:
+    out_dir = "/tmp"
+    base = os.path.splitext(os.path.basename(wav_path))[0]
+    txt_path = os.path.join(out_dir, f"{base}.txt")
+    try:
+        os.remove(txt_path)
+    except FileNotFoundError:
+        pass
+
+    subprocess.run(
+        [
+            "whisper", wav_path,
+            "--model", WHISPER_MODEL,
+            "--language", LANG,
+            "--fp16", "False",
+            "--output_format", "txt",
+            "--output_dir", out_dir,
+        ],
+        check=True,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+    if not os.path.exists(txt_path):
+        return ""
+    with open(txt_path, "r", encoding="utf-8") as f:
+        return f.read().strip()
+
+
+def ask_rasa(text: str, sender: str = SENDER) -> str:
+    r = requests.post(RASA_URL, json={"sender": sender, "message": text}, timeout=30)
+    r.raise_for_status()
+    msgs = r.json()
+    return " ".join(m.get("text", "") for m in msgs if m.get("text")).strip()
+
+
+def send_intent(intent_name: str, sender: str = SENDER) -> str:
+    """
+    Send a slash intent via the normal webhook pipeline.
+    This is more reliable than trigger_intent + empty message.
+    """
+    return ask_rasa(f"/{intent_name}", sender)
+
+
+def classify_yesno(text: str):
+    """
+    Returns "yes", "no", or None.
+    """
+    t = text.strip().lower()
+
+    yes_words = [
+        "yes", "yeah", "yep", "yup", "sure", "correct", "fixed", "works", "working",
+        "it works", "it worked", "now works", "now it works"
+    ]
+    no_words = [
+        "no", "nope", "nah", "not", "still", "still broken", "doesn't", "doesnt",
+        "not working", "no change", "didn't", "didnt"
+    ]
+
+
+    if t in ["yes", "yeah", "yep", "yup"]:
+        return "yes"
+    if t in ["no", "nope", "nah"]:
+        return "no"
+
+    if any(w in t for w in yes_words):
+        return "yes"
+    if any(w in t for w in no_words):
+        return "no"
+    return None
+
+
+def guard_bits(after: bool = False) -> int:
+    bits = 0
+    if waiting_yesno:
+        bits |= session_recorder.YESNO_AFTER if after else session_recorder.YESNO_BEFORE
+    if waiting_for_platform:
+        bits |= session_recorder.PLATFORM_AFTER if after else session_recorder.PLATFORM_BEFORE
+    return bits
+
+
+def route_text(user_text: str, sender: str = SENDER) -> str:
+    """
+    Apply the client-side guards, ask Rasa, and update guard state from the reply.
+    Raises if Rasa can't be reached.
+    """
+    global waiting_for_platform, waiting_yesno
+
+    # 1) YES/NO GUARD (highest priority)
+    if waiting_yesno:
+        yn = classify_yesno(user_text)
+        if yn == "yes":
+            bot_text = send_intent("affirm", sender)
+            waiting_yesno = False
+        elif yn == "no":
+            bot_text = send_intent("deny", sender)
+            waiting_yesno = False
+        else:
+            bot_text = "Just say yes or no."
+            # keep waiting
+
+    # 2) PLATFORM GUARD
+    elif waiting_for_platform:
+        t = user_text.strip().lower()
+
+        if any(k in t for k in ["linux", "ubuntu", "debian", "arch", "fedora", "mint", "kali"]):
+            bot_text = send_intent("platform_linux", sender)
+            waiting_for_platform = False
+        elif any(k in t for k in ["windows", "win", "win10", "win11", "windows 10", "windows 11"]):
+            bot_text = send_intent("platform_windows", sender)
+            waiting_for_platform = False
+        elif any(k in t for k in ["mac", "macos", "osx", "macbook", "apple"]):
+            bot_text = send_intent("platform_macos", sender)
+            waiting_for_platform = False
+        else:
+            bot_text = "Just say Windows, macOS, or Linux."
+
+
+    # 3) NORMAL FLOW
+    else:
+        bot_text = ask_rasa(user_text, sender)
+
+    if not bot_text:
+        bot_text = "Say that again but, like, clearer."
+
+    # Detect modes from bot text
+    low = bot_text.lower()
+    if "which platform are you on" in low:
+        waiting_for_platform = True
+    if "did that fix it" in low or "did that help" in low:
+        waiting_yesno = True
+
+    return bot_text